@@ -5,17 +5,122 @@ Bu modül dalga analizi ve insan tespiti işlemlerini koordine eder.
 """
 
 import cv2
+import logging
 import numpy as np
 import time
+import queue
 import threading
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from wave_analyzer import WaveIntensityAnalyzer
 from people_detector import PeopleDetector
 from esp32_camera import ESP32Camera, CameraManager
 from database import db_manager, WaveAnalysis
+from ttl_cache import TTLCache
+from jpeg_codec import write_jpeg
+from batching import collect_batch
+import metrics
+
+
+log = logging.getLogger(__name__)
+
+# Kamera thread'leri ve batch tespit aynı anda OpenCV çağırdığından
+# OpenCV'nin iç thread havuzu aşırı abonelik olmaması için sınırlanır
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+
+# Analiz aralığı (saniye)
+ANALYSIS_INTERVAL = int(os.getenv('ANALYSIS_INTERVAL', 5))
+
+# İnsan tespiti sonucunu bekleme süresi (saniye)
+DETECT_TIMEOUT = 30
+
+# Analizörlerin ortak kullandığı küçültülmüş frame'in uzun kenarı (piksel)
+ANALYSIS_MAX_SIDE = 640
+
+# Durdurulan analiz thread'lerini bekleme süresi (saniye)
+STOP_JOIN_TIMEOUT = 10
+
+# Sahne değişmediyse analizi atlama ayarları
+SKIP_GATE_SIZE = 64  # piksel, karşılaştırma için küçültülmüş gri frame kenarı
+SKIP_DIFF_THRESHOLD = 1.5  # ortalama piksel farkı bunun altındaysa önceki sonuç kullanılır
+
+# Kamera başına önceden ayrılan frame tamponu sayısı
+FRAME_RING_SIZE = 4
+
+# Toplu kayıt ayarları
+PERSIST_QUEUE_SIZE = 64
+PERSIST_BATCH_SIZE = 32
+PERSIST_FLUSH_INTERVAL = 1.0  # saniye
+
+# Kamera durumu birden fazla endpoint'ten arka arkaya istendiği için kısa süre önbelleklenir
+STATUS_CACHE_TTL = 2  # saniye
+
+
+class _FrameRing:
+    """Kamera başına yeniden kullanılan frame tamponları"""
+    
+    def __init__(self, size: int = FRAME_RING_SIZE):
+        # Slotlar ilk frame geldiğinde doldurulur; kopyalanan veya paylaşılan
+        # (salt okunur) frame'i tutar
+        self.slots: List[Optional[np.ndarray]] = [None] * size
+        
+        # Boş slot indeksleri; semafor gibi davranır
+        self._free = queue.Queue()
+        for index in range(size):
+            self._free.put(index)
+    
+    def acquire(self, timeout: float) -> Optional[int]:
+        """Boş bir slot indeksi alır, süre dolarsa None döner"""
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def release(self, index: int):
+        """Slotu yeniden kullanıma bırakır"""
+        self._free.put(index)
+
+
+class _CameraPipeline:
+    """Tek bir kameranın capture → analiz hattı"""
+    
+    def __init__(self, camera_id: str):
+        self.camera_id = camera_id
+        self.stop_event = threading.Event()
+        
+        # Capture ve analiz aşamaları arası sınırlı kuyruk (frame yerine slot indeksi taşır)
+        self.frame_ring = _FrameRing()
+        self.capture_q = queue.Queue(maxsize=2)
+        
+        # Dalga analizörü önceki frame'i ve geçmişi tuttuğu için her kameraya ayrı
+        self.wave_analyzer = WaveIntensityAnalyzer()
+        
+        # Değişmeyen sahnelerde analizi atlamak için son analiz edilen frame ve sonucu
+        self.prev_gray: Optional[np.ndarray] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        
+        self.threads: List[threading.Thread] = []
+    
+    def is_alive(self) -> bool:
+        """Hattın herhangi bir aşaması çalışıyor mu"""
+        return any(thread.is_alive() for thread in self.threads)
+    
+    def join(self, deadline: float) -> bool:
+        """
+        Hattın thread'lerinin bitmesini bekler
+        
+        Args:
+            deadline: time.monotonic() cinsinden son bekleme zamanı
+            
+        Returns:
+            Tüm thread'ler bittiyse True
+        """
+        for thread in self.threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        return not self.is_alive()
 
 
 class AnalysisEngine:
@@ -26,16 +131,30 @@ class AnalysisEngine:
         self.people_detector = PeopleDetector()
         self.camera_manager = CameraManager()
         
-        # Analiz durumu
-        self.is_running = False
-        self.analysis_threads = {}
+        # Analiz durumu (kamera ID'si → analiz hattı)
+        self.analysis_threads: Dict[str, _CameraPipeline] = {}
+        # Sonuçlar kopyala-değiştir ile güncellenir: okuyucular kilitsiz, sözlük
+        # hiçbir zaman yerinde değiştirilmez, sadece attribute yeniden bağlanır
         self.analysis_results = {}
+        self._results_lock = threading.Lock()
+        self._status_cache = TTLCache(ttl=STATUS_CACHE_TTL, maxsize=128)
+        
+        # Toplu kayıt: frame'ler thread havuzunda, satırlar tek thread'de yazılır
+        self._persist_q = queue.Queue(maxsize=PERSIST_QUEUE_SIZE)
+        metrics.PERSIST_QUEUE_DEPTH.set_function(self._persist_q.qsize)
+        self._persist_thread = None
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._workers_lock = threading.Lock()
         
         # Frame kaydetme ayarları
         self.save_frames = True
         self.frames_dir = "saved_frames"
         os.makedirs(self.frames_dir, exist_ok=True)
         
+        # Günlük alt dizin saatte bir yeniden hesaplanır
+        self._current_hour = None
+        self._current_day_dir = None
+        
     def add_camera(self, camera_id: str, ip_address: str, port: int = 80,
                    username: str = None, password: str = None) -> bool:
         """
@@ -53,9 +172,24 @@ class AnalysisEngine:
         """
         success = self.camera_manager.add_camera(camera_id, ip_address, port, username, password)
         if success:
-            print(f"Kamera {camera_id} başarıyla eklendi")
+            log.info("Kamera %s başarıyla eklendi", camera_id)
         return success
     
+    def add_cameras_bulk(self, cameras: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """
+        Analiz motoruna birden fazla kamerayı paralel bağlantı testiyle ekler
+        
+        Args:
+            cameras: Kamera bilgileri (camera_id, ip_address, port, username, password)
+            
+        Returns:
+            Kamera ID'sine göre başarı durumu
+        """
+        results = self.camera_manager.add_cameras_bulk(cameras)
+        connected = sum(results.values())
+        log.info("%d/%d kamera başarıyla eklendi", connected, len(results))
+        return results
+    
     def start_analysis(self, camera_id: str) -> bool:
         """
         Belirtilen kamera için analizi başlatır
@@ -66,102 +200,239 @@ class AnalysisEngine:
         Returns:
             Başarı durumu
         """
-        if camera_id in self.analysis_threads and self.analysis_threads[camera_id].is_alive():
-            print(f"Kamera {camera_id} için analiz zaten çalışıyor")
+        pipeline = self.analysis_threads.get(camera_id)
+        if pipeline and pipeline.is_alive():
+            log.info("Kamera %s için analiz zaten çalışıyor", camera_id)
             return True
             
         camera = self.camera_manager.get_camera(camera_id)
         if not camera:
-            print(f"Kamera {camera_id} bulunamadı")
+            log.warning("Kamera %s bulunamadı", camera_id)
             return False
             
-        # Analiz thread'ini başlat
-        analysis_thread = threading.Thread(
-            target=self._analysis_worker,
-            args=(camera_id,),
-            daemon=True
-        )
-        analysis_thread.start()
+        self._ensure_background_workers()
         
-        self.analysis_threads[camera_id] = analysis_thread
-        self.is_running = True
+        # capture → analiz thread'lerini başlat
+        pipeline = _CameraPipeline(camera_id)
+        for worker in (self._capture_worker, self._analyze_worker):
+            pipeline.threads.append(threading.Thread(
+                target=worker,
+                args=(camera, pipeline),
+                daemon=True
+            ))
         
-        print(f"Kamera {camera_id} için analiz başlatıldı")
+        self.analysis_threads[camera_id] = pipeline
+        self._status_cache.pop(camera_id)
+        metrics.CAPTURE_QUEUE_DEPTH.labels(camera_id).set_function(pipeline.capture_q.qsize)
+        
+        for thread in pipeline.threads:
+            thread.start()
+        
+        log.info("Kamera %s için analiz başlatıldı", camera_id)
         return True
     
     def stop_analysis(self, camera_id: str):
         """Belirtilen kamera için analizi durdurur"""
-        if camera_id in self.analysis_threads:
-            # Thread'i durdur (daemon thread olduğu için otomatik kapanacak)
-            self.analysis_threads.pop(camera_id, None)
-            print(f"Kamera {camera_id} için analiz durduruldu")
+        pipeline = self.analysis_threads.pop(camera_id, None)
+        self._status_cache.pop(camera_id)
+        if pipeline:
+            pipeline.stop_event.set()
+            self._remove_queue_metric(camera_id)
+            if not pipeline.join(time.monotonic() + STOP_JOIN_TIMEOUT):
+                log.warning("Kamera %s analiz thread'leri %s saniyede durmadı",
+                            camera_id, STOP_JOIN_TIMEOUT)
+            log.info("Kamera %s için analiz durduruldu", camera_id)
     
     def stop_all_analysis(self):
         """Tüm analizleri durdurur"""
-        self.is_running = False
-        self.analysis_threads.clear()
-        print("Tüm analizler durduruldu")
+        pipelines = self.analysis_threads
+        self.analysis_threads = {}
+        self._status_cache.clear()
+        
+        # Önce tüm hatlara sinyal verilir, sonra ortak süre içinde beklenir
+        for camera_id, pipeline in pipelines.items():
+            pipeline.stop_event.set()
+            self._remove_queue_metric(camera_id)
+        
+        deadline = time.monotonic() + STOP_JOIN_TIMEOUT
+        for camera_id, pipeline in pipelines.items():
+            if not pipeline.join(deadline):
+                log.warning("Kamera %s analiz thread'leri %s saniyede durmadı",
+                            camera_id, STOP_JOIN_TIMEOUT)
+        log.info("Tüm analizler durduruldu")
     
-    def _analysis_worker(self, camera_id: str):
-        """Analiz worker thread'i"""
-        camera = self.camera_manager.get_camera(camera_id)
-        if not camera:
-            return
-            
+    @staticmethod
+    def _remove_queue_metric(camera_id: str):
+        """Durdurulan kameranın kuyruk metriğini kaldırır"""
+        try:
+            metrics.CAPTURE_QUEUE_DEPTH.remove(camera_id)
+        except KeyError:
+            pass
+    
+    def _ensure_background_workers(self):
+        """Kameralar arası ortak thread'leri gerekirse başlatır"""
+        with self._workers_lock:
+            if self._persist_thread is None or not self._persist_thread.is_alive():
+                self._persist_thread = threading.Thread(
+                    target=self._persist_worker,
+                    daemon=True
+                )
+                self._persist_thread.start()
+    
+    @staticmethod
+    def _put_latest(q: queue.Queue, item) -> list:
+        """Kuyruk doluysa en eski öğeyi atarak yeni öğeyi ekler, atılanları döner"""
+        dropped = []
+        while True:
+            try:
+                q.put_nowait(item)
+                return dropped
+            except queue.Full:
+                try:
+                    dropped.append(q.get_nowait())
+                except queue.Empty:
+                    pass
+    
+    def _capture_worker(self, camera: ESP32Camera, pipeline: _CameraPipeline):
+        """Capture aşaması: kameradan frame alıp analiz kuyruğuna koyar"""
+        camera_id = pipeline.camera_id
+        stop_event = pipeline.stop_event
+        ring = pipeline.frame_ring
+        
         # Stream'i başlat
         if not camera.start_stream():
-            print(f"Kamera {camera_id} stream başlatılamadı")
+            log.error("Kamera %s stream başlatılamadı", camera_id)
+            stop_event.set()
             return
             
-        print(f"Kamera {camera_id} analizi başladı")
+        log.info("Kamera %s analizi başladı", camera_id)
         
-        while self.is_running and camera_id in self.analysis_threads:
+        while not stop_event.is_set():
+            # Tüm slotlar doluysa analiz veya kayıt geride demektir
+            slot = ring.acquire(timeout=1)
+            if slot is None:
+                metrics.FRAMES_DROPPED.labels(camera_id, 'no_free_buffer').inc()
+                continue
+            
             try:
-                # Frame al
-                frame = camera.get_current_frame()
+                # Frame'i slota al (kamera salt okunur önbelleğini dönerse kopya yapılmaz)
+                frame = camera.get_current_frame(out=ring.slots[slot])
                 if frame is None:
-                    time.sleep(1)
+                    ring.release(slot)
+                    stop_event.wait(1)
                     continue
+                ring.slots[slot] = frame
+                
+                # Analiz geride kalırsa eski frame'i at, en güncelini analiz et
+                for dropped_slot in self._put_latest(pipeline.capture_q, slot):
+                    ring.release(dropped_slot)
+                    metrics.FRAMES_DROPPED.labels(camera_id, 'capture_queue_full').inc()
                 
+                stop_event.wait(ANALYSIS_INTERVAL)
+                
+            except Exception:
+                ring.release(slot)
+                log.exception("Kamera %s frame alma hatası", camera_id)
+                stop_event.wait(ANALYSIS_INTERVAL)
+        
+        # Stream'i durdur
+        camera.stop_stream()
+        log.info("Kamera %s analizi durdu", camera_id)
+    
+    def _analyze_worker(self, camera: ESP32Camera, pipeline: _CameraPipeline):
+        """Analiz aşaması: kuyruktaki frame'leri analiz edip kayıt kuyruğuna koyar"""
+        camera_id = pipeline.camera_id
+        stop_event = pipeline.stop_event
+        ring = pipeline.frame_ring
+        
+        while not stop_event.is_set():
+            try:
+                slot = pipeline.capture_q.get(timeout=1)
+            except queue.Empty:
+                continue
+            
+            try:
                 # Analiz yap
                 start_time = time.time()
-                analysis_result = self._analyze_frame(frame, camera_id)
+                analysis_result = self._analyze_frame(ring.slots[slot], pipeline)
                 processing_time = time.time() - start_time
                 
                 # Sonucu kaydet
                 analysis_result['processing_time'] = processing_time
-                self.analysis_results[camera_id] = analysis_result
+                self._store_result(camera_id, analysis_result)
                 
-                # Veritabanına kaydet
-                self._save_analysis_to_db(camera_id, analysis_result, frame)
+                # Frame kaydedilmeyecekse slot hemen serbest bırakılır
+                if not self.save_frames:
+                    ring.release(slot)
+                    slot = None
                 
-                # 5 saniye bekle
-                time.sleep(5)
+                # Kayıt kuyruğuna aktar (disk takılırsa en eski kayıt atılır)
+                dropped = self._put_latest(self._persist_q, (pipeline, analysis_result, slot))
+                for dropped_pipeline, _, dropped_slot in dropped:
+                    if dropped_slot is not None:
+                        dropped_pipeline.frame_ring.release(dropped_slot)
+                    metrics.FRAMES_DROPPED.labels(dropped_pipeline.camera_id, 'persist_queue_full').inc()
                 
-            except Exception as e:
-                print(f"Kamera {camera_id} analiz hatası: {e}")
-                time.sleep(5)
-        
-        # Stream'i durdur
-        camera.stop_stream()
-        print(f"Kamera {camera_id} analizi durdu")
+            except Exception:
+                if slot is not None:
+                    ring.release(slot)
+                log.exception("Kamera %s analiz hatası", camera_id)
     
-    def _analyze_frame(self, frame: np.ndarray, camera_id: str) -> Dict[str, Any]:
+    def _store_result(self, camera_id: str, analysis_result: Dict[str, Any]):
+        """Kameranın son sonucunu yeni bir sözlükle değiştirerek yayınlar"""
+        with self._results_lock:
+            self.analysis_results = {**self.analysis_results, camera_id: analysis_result}
+    
+    def _persist_worker(self):
+        """Kayıt thread'i: analiz sonuçlarını toplu olarak diske ve veritabanına yazar"""
+        while True:
+            batch = collect_batch(self._persist_q, PERSIST_BATCH_SIZE, PERSIST_FLUSH_INTERVAL)
+            try:
+                self._save_analyses_to_db(batch)
+            except Exception:
+                # Bağlantı kopması vb. sadece bu batch'i kaybettirir, thread çalışmaya devam eder
+                log.exception("Toplu analiz kaydı hatası (%d kayıt)", len(batch))
+    
+    def _analyze_frame(self, frame: np.ndarray, pipeline: _CameraPipeline) -> Dict[str, Any]:
         """
         Tek bir frame'i analiz eder
         
         Args:
             frame: Analiz edilecek frame
-            camera_id: Kamera ID'si
+            pipeline: Kameranın analiz hattı
             
         Returns:
             Analiz sonuçları
         """
-        # Dalga analizi
-        wave_analysis = self.wave_analyzer.analyze_wave_intensity(frame)
+        camera_id = pipeline.camera_id
+        
+        # Sahne bir önceki analizden beri değişmediyse pahalı analizleri atla
+        tiny = cv2.resize(frame, (SKIP_GATE_SIZE, SKIP_GATE_SIZE), interpolation=cv2.INTER_AREA)
+        tiny_gray = cv2.cvtColor(tiny, cv2.COLOR_BGR2GRAY)
+        if pipeline.prev_gray is not None and pipeline.last_result is not None:
+            score = cv2.absdiff(tiny_gray, pipeline.prev_gray).mean()
+            if score < SKIP_DIFF_THRESHOLD:
+                metrics.ANALYSES_SKIPPED.labels(camera_id=camera_id).inc()
+                return {**pipeline.last_result, 'timestamp': datetime.utcnow(), 'cached': True}
+        
+        # Küçültme bir kez yapılıp iki analizöre de verilir
+        height, width = frame.shape[:2]
+        scale = ANALYSIS_MAX_SIDE / max(height, width)
+        if scale < 1:
+            small = cv2.resize(frame, (int(width * scale), int(height * scale)),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
         
-        # İnsan tespiti
-        people_analysis = self.people_detector.detect_people(frame)
+        # İnsan tespitini batch kuyruğuna gönder (diğer kameralar ve API ile aynı batch'e girebilir)
+        people_future = self.people_detector.detect_people_async(frame, small=small)
+        
+        # Tespit beklenirken dalga analizi
+        with metrics.ANALYSIS_WAVE_SECONDS.time():
+            wave_analysis = pipeline.wave_analyzer.analyze_wave_intensity(frame, small=small)
+        
+        # İnsan tespiti sonucu
+        people_analysis = people_future.result(timeout=DETECT_TIMEOUT)
         
         # Sonuçları birleştir
         result = {
@@ -172,41 +443,71 @@ class AnalysisEngine:
             'frame_shape': frame.shape
         }
         
+        # Karşılaştırma tabanı sadece gerçek analizlerde güncellenir
+        pipeline.prev_gray = tiny_gray
+        pipeline.last_result = result
+        
         return result
     
-    def _save_analysis_to_db(self, camera_id: str, analysis_result: Dict[str, Any], frame: np.ndarray):
-        """Analiz sonucunu veritabanına kaydeder"""
+    def _get_day_dir(self) -> str:
+        """Frame'lerin yazılacağı günlük dizini döner"""
+        hour = int(time.time() // 3600)
+        if hour != self._current_hour:
+            self._current_day_dir = f"{self.frames_dir}/{datetime.now():%Y%m%d}"
+            os.makedirs(self._current_day_dir, exist_ok=True)
+            self._current_hour = hour
+        return self._current_day_dir
+    
+    def _submit_frame_write(self, pipeline: _CameraPipeline, slot: int) -> str:
+        """Slottaki frame'i thread havuzunda JPEG olarak yazar, yazma bitince slotu bırakır"""
+        ring = pipeline.frame_ring
         try:
-            # Frame'i kaydet
-            frame_path = None
-            if self.save_frames:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                frame_filename = f"{camera_id}_{timestamp}.jpg"
-                frame_path = os.path.join(self.frames_dir, frame_filename)
-                cv2.imwrite(frame_path, frame)
-            
-            # Veritabanı kaydı
-            db_data = {
-                'camera_id': camera_id,
-                'timestamp': analysis_result['timestamp'],
-                'current_intensity': analysis_result['wave_analysis']['current_intensity'],
-                'average_intensity': analysis_result['wave_analysis']['average_intensity'],
-                'motion_score': analysis_result['wave_analysis']['motion_score'],
-                'edge_score': analysis_result['wave_analysis']['edge_score'],
-                'pattern_score': analysis_result['wave_analysis']['pattern_score'],
-                'intensity_level': analysis_result['wave_analysis']['intensity_level'],
-                'description': analysis_result['wave_analysis']['description'],
-                'people_count': analysis_result['people_analysis']['people_count'],
-                'crowd_level': analysis_result['people_analysis']['crowd_level'],
-                'crowd_score': analysis_result['people_analysis']['crowd_score'],
-                'frame_path': frame_path,
-                'processing_time': analysis_result['processing_time']
-            }
-            
-            db_manager.add_wave_analysis(db_data)
-            
-        except Exception as e:
-            print(f"Veritabanı kaydetme hatası: {e}")
+            # Milisaniye çözünürlüğü aynı saniyedeki kayıtların üst üste yazılmasını önler
+            frame_path = f"{self._get_day_dir()}/{pipeline.camera_id}_{int(time.time() * 1000)}.jpg"
+            future = self._io_pool.submit(write_jpeg, frame_path, ring.slots[slot], 85)
+        except Exception:
+            ring.release(slot)
+            raise
+        
+        future.add_done_callback(lambda _: ring.release(slot))
+        return frame_path
+    
+    def _save_analyses_to_db(self, batch: List[tuple]):
+        """Analiz sonuçlarını toplu olarak veritabanına kaydeder"""
+        rows = []
+        
+        for pipeline, analysis_result, slot in batch:
+            camera_id = pipeline.camera_id
+            try:
+                # Frame'i kaydet
+                frame_path = None
+                if slot is not None:
+                    frame_path = self._submit_frame_write(pipeline, slot)
+                
+                # Veritabanı kaydı
+                rows.append({
+                    'camera_id': camera_id,
+                    'timestamp': analysis_result['timestamp'],
+                    'current_intensity': analysis_result['wave_analysis']['current_intensity'],
+                    'average_intensity': analysis_result['wave_analysis']['average_intensity'],
+                    'motion_score': analysis_result['wave_analysis']['motion_score'],
+                    'edge_score': analysis_result['wave_analysis']['edge_score'],
+                    'pattern_score': analysis_result['wave_analysis']['pattern_score'],
+                    'intensity_level': analysis_result['wave_analysis']['intensity_level'],
+                    'description': analysis_result['wave_analysis']['description'],
+                    'people_count': analysis_result['people_analysis']['people_count'],
+                    'crowd_level': analysis_result['people_analysis']['crowd_level'],
+                    'crowd_score': analysis_result['people_analysis']['crowd_score'],
+                    'frame_path': frame_path,
+                    'processing_time': analysis_result['processing_time']
+                })
+                
+            except Exception:
+                log.exception("Veritabanı kaydetme hatası")
+        
+        if rows:
+            with metrics.DB_WRITE_SECONDS.time():
+                db_manager.add_wave_analysis_many(rows)
     
     def get_latest_result(self, camera_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -219,8 +520,9 @@ class AnalysisEngine:
             En son analiz sonucu veya None
         """
         # Önce memory'den kontrol et
-        if camera_id in self.analysis_results:
-            return self.analysis_results[camera_id]
+        result = self.analysis_results.get(camera_id)
+        if result is not None:
+            return result
         
         # Veritabanından getir
         latest_analysis = db_manager.get_latest_analysis(camera_id)
@@ -229,17 +531,39 @@ class AnalysisEngine:
         
         return None
     
-    def get_all_latest_results(self) -> Dict[str, Any]:
-        """Tüm kameraların en son sonuçlarını getirir"""
+    def get_latest_results(self, camera_ids: List[str]) -> Dict[str, Any]:
+        """
+        Birden fazla kameranın en son analiz sonuçlarını getirir
+        
+        Memory'de olmayanlar veritabanından tek sorguda alınır.
+        
+        Args:
+            camera_ids: Kamera ID'leri
+            
+        Returns:
+            Kamera ID'sine göre en son analiz sonuçları
+        """
         results = {}
+        missing = []
+        analysis_results = self.analysis_results
         
-        for camera_id in self.camera_manager.get_all_cameras().keys():
-            result = self.get_latest_result(camera_id)
-            if result:
-                results[camera_id] = result
+        for camera_id in camera_ids:
+            if camera_id in analysis_results:
+                results[camera_id] = analysis_results[camera_id]
+            else:
+                missing.append(camera_id)
+        
+        if missing:
+            latest_analyses = db_manager.get_latest_analyses_for_all(missing)
+            for camera_id, analysis in latest_analyses.items():
+                results[camera_id] = analysis.to_dict()
         
         return results
     
+    def get_all_latest_results(self) -> Dict[str, Any]:
+        """Tüm kameraların en son sonuçlarını getirir"""
+        return self.get_latest_results(list(self.camera_manager.get_all_cameras().keys()))
+    
     def get_analysis_history(self, camera_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Kameranın analiz geçmişini getirir
@@ -249,32 +573,71 @@ class AnalysisEngine:
             limit: Maksimum kayıt sayısı
             
         Returns:
-            Analiz geçmişi listesi
+            Analiz geçmişi listesi (WaveAnalysis.to_dict yapısında, timestamp ISO metni)
         """
-        analyses = db_manager.get_analysis_history(camera_id, limit)
-        return [analysis.to_dict() for analysis in analyses]
+        history = db_manager.list_analyses_dicts(camera_id, limit)
+        for analysis in history:
+            if analysis['timestamp'] is not None:
+                analysis['timestamp'] = analysis['timestamp'].isoformat()
+        return history
+    
+    def iter_analysis_history(self, camera_id: str, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Kameranın analiz geçmişini tamamını belleğe almadan sırayla döner
+        
+        Args:
+            camera_id: Kamera ID'si
+            limit: Maksimum kayıt sayısı
+            
+        Returns:
+            Analiz sonucu sözlükleri üreten iterator (timestamp datetime olarak
+            bırakılır, JSON'a API katmanında orjson çevirir)
+        """
+        return db_manager.iter_analysis_history(camera_id, limit)
     
     def get_camera_status(self, camera_id: str) -> Dict[str, Any]:
-        """Kamera durumunu getirir"""
+        """Kamera durumunu getirir (kısa süreli önbellekli)"""
+        return self._status_cache.get_or_set(
+            camera_id, lambda: self._build_camera_status(camera_id)
+        )
+    
+    def _build_camera_status(self, camera_id: str, has_result: bool = None) -> Dict[str, Any]:
+        """Kamera durumunu hesaplar"""
         camera = self.camera_manager.get_camera(camera_id)
         if not camera:
             return {'error': 'Kamera bulunamadı'}
         
+        if has_result is None:
+            has_result = self.get_latest_result(camera_id) is not None
+        
         return {
             'camera_id': camera_id,
             'ip_address': camera.ip_address,
             'connected': camera.is_connected(),
             'streaming': camera.is_streaming,
             'analyzing': camera_id in self.analysis_threads and self.analysis_threads[camera_id].is_alive(),
-            'last_result': self.get_latest_result(camera_id) is not None
+            'last_result': has_result
         }
     
     def get_all_camera_statuses(self) -> Dict[str, Dict[str, Any]]:
         """Tüm kameraların durumunu getirir"""
         statuses = {}
+        missing = []
         
         for camera_id in self.camera_manager.get_all_cameras().keys():
-            statuses[camera_id] = self.get_camera_status(camera_id)
+            status = self._status_cache.get(camera_id)
+            if status is None:
+                missing.append(camera_id)
+            else:
+                statuses[camera_id] = status
+        
+        # Önbellekte olmayanların son sonuçları tek sorguda alınır
+        if missing:
+            latest_results = self.get_latest_results(missing)
+            for camera_id in missing:
+                status = self._build_camera_status(camera_id, camera_id in latest_results)
+                self._status_cache.set(camera_id, status)
+                statuses[camera_id] = status
         
         return statuses
 
@@ -4,25 +4,85 @@ Flask REST API
 Bu modül mobil uygulama için REST API endpoint'lerini sağlar.
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from flask_cors import CORS
 import os
 import cv2
+import itertools
+import orjson
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 
 from analysis_engine import analysis_engine
-from database import db_manager, Camera, CameraRequest
-from wave_analyzer import WaveIntensityAnalyzer
-from people_detector import PeopleDetector
+from ttl_cache import TTLCache
+from database import db_manager, db_session, Camera, CameraRequest
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Log kayıtlarını kuyruk üzerinden tek bir arka plan thread'ine yönlendirir
+    
+    Worker thread'ler sadece kuyruğa ekleme yapar, stderr'e yazma işini
+    dinleyici thread üstlenir.
+    
+    Args:
+        level: Kök logger seviyesi
+        
+    Returns:
+        Başlatılmış kuyruk dinleyicisi
+    """
+    root_logger = logging.getLogger()
+    
+    # Fork sonrası yeniden çağrıldığında eski kuyruk handler'ını kaldır
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            root_logger.removeHandler(handler)
+    
+    log_queue = queue.Queue(-1)
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    
+    listener.start()
+    return listener
+
+
+log_listener = configure_logging()
 
 app = Flask(__name__)
 CORS(app)  # CORS desteği ekle
 
-# Analiz modülleri
-wave_analyzer = WaveIntensityAnalyzer()
-people_detector = PeopleDetector()
+# Yüklenen dosya boyutu sınırı
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 16)) * 1024 * 1024
+
+# Görüntü analizleri için ortak thread havuzu (OpenCV ve YOLO GIL'i bırakır)
+EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# /api/stats panolar tarafından sık sorgulanır, sonuç kısa süre önbellekte tutulur
+STATS_CACHE = TTLCache(ttl=5, maxsize=1)
+
+# ?reduce= parametresi için decode bayrakları (küçültme libjpeg içinde yapılır)
+DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4
+}
+
+
+@app.teardown_appcontext
+def remove_db_session(exception=None):
+    """İstek sonunda thread'e ait veritabanı oturumunu kaldırır"""
+    db_session.remove()
 
 
 @app.route('/api/health', methods=['GET'])
@@ -35,6 +95,12 @@ def health_check():
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Analiz hattı metrikleri (Prometheus formatı)"""
+    return Response(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+
+
 # Kamera yönetimi endpoint'leri
 @app.route('/api/cameras', methods=['GET'])
 def get_cameras():
@@ -43,15 +109,20 @@ def get_cameras():
         cameras = db_manager.get_all_cameras()
         camera_list = []
         
+        # Durumlar ve son sonuçlar kamera başına sorgu yerine toplu alınır
+        statuses = analysis_engine.get_all_camera_statuses()
+        latest_results = analysis_engine.get_latest_results([camera.camera_id for camera in cameras])
+        
         for camera in cameras:
             camera_data = camera.to_dict()
             # Kamera durumunu ekle
-            status = analysis_engine.get_camera_status(camera.camera_id)
+            status = statuses.get(camera.camera_id)
+            if status is None:
+                status = analysis_engine.get_camera_status(camera.camera_id)
             camera_data['status'] = status
             
             # En son analiz sonucunu ekle
-            latest_result = analysis_engine.get_latest_result(camera.camera_id)
-            camera_data['latest_analysis'] = latest_result
+            camera_data['latest_analysis'] = latest_results.get(camera.camera_id)
             
             camera_list.append(camera_data)
         
@@ -146,6 +217,52 @@ def add_camera():
         }), 500
 
 
+@app.route('/api/cameras/bulk', methods=['POST'])
+def add_cameras_bulk():
+    """Birden fazla kamerayı tek istekte ekle"""
+    try:
+        data = request.get_json()
+        cameras = data.get('cameras') if isinstance(data, dict) else None
+        if not isinstance(cameras, list) or not cameras:
+            return jsonify({
+                'status': 'error',
+                'message': 'cameras listesi gerekli'
+            }), 400
+        
+        required_fields = ['camera_id', 'name', 'location', 'ip_address']
+        for index, camera_data in enumerate(cameras):
+            for field in required_fields:
+                if field not in camera_data:
+                    return jsonify({
+                        'status': 'error',
+                        'message': f'Eksik alan: cameras[{index}].{field}'
+                    }), 400
+        
+        # Kameraları veritabanına tek sorguda ekle
+        if not db_manager.add_cameras_many(cameras):
+            return jsonify({
+                'status': 'error',
+                'message': 'Kameralar eklenemedi'
+            }), 500
+        
+        # Bağlantılar paralel test edilerek analiz motoruna eklenir
+        connected = analysis_engine.add_cameras_bulk(cameras)
+        failed = [camera_id for camera_id, success in connected.items() if not success]
+        
+        return jsonify({
+            'status': 'warning' if failed else 'success',
+            'message': f'{len(cameras)} kamera eklendi, {len(failed)} kameraya bağlantı kurulamadı',
+            'connected': [camera_id for camera_id, success in connected.items() if success],
+            'failed': failed
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
 # Analiz endpoint'leri
 @app.route('/api/cameras/<camera_id>/start', methods=['POST'])
 def start_analysis(camera_id):
@@ -218,13 +335,14 @@ def get_analysis_history(camera_id):
     """Kameranın analiz geçmişini getir"""
     try:
         limit = request.args.get('limit', 100, type=int)
-        history = analysis_engine.get_analysis_history(camera_id, limit)
+        history = analysis_engine.iter_analysis_history(camera_id, limit)
         
-        return jsonify({
-            'status': 'success',
-            'history': history,
-            'count': len(history)
-        })
+        # İlk kayıt burada okunur: veritabanı hataları akış başlamadan 500 döner
+        first = next(history, None)
+        if first is not None:
+            history = itertools.chain([first], history)
+        
+        return Response(_stream_history_json(history), content_type='application/json')
         
     except Exception as e:
         return jsonify({
@@ -233,6 +351,19 @@ def get_analysis_history(camera_id):
         }), 500
 
 
+def _stream_history_json(history: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """Geçmiş kayıtlarını tek JSON yanıtı olarak parça parça üretir"""
+    yield b'{"status": "success", "history": ['
+    count = 0
+    for item in history:
+        if count:
+            yield b', '
+        # orjson datetime'ları isoformat ile aynı biçimde C tarafında yazar
+        yield orjson.dumps(item)
+        count += 1
+    yield b'], "count": %d}' % count
+
+
 # Canlı analiz endpoint'i
 @app.route('/api/analyze', methods=['POST'])
 def analyze_image():
@@ -246,9 +377,16 @@ def analyze_image():
         
         file = request.files['image']
         
-        # Görüntüyü oku
-        image_array = np.frombuffer(file.read(), dtype=np.uint8)
-        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+        reduce = request.args.get('reduce', 1, type=int)
+        if reduce not in DECODE_FLAGS:
+            return jsonify({
+                'status': 'error',
+                'message': 'reduce değeri 1, 2 veya 4 olmalı'
+            }), 400
+        
+        # Görüntüyü oku (frombuffer kopyalamaz, istenirse decode sırasında küçültülür)
+        image_array = np.frombuffer(file.stream.read(), dtype=np.uint8)
+        image = cv2.imdecode(image_array, DECODE_FLAGS[reduce])
         
         if image is None:
             return jsonify({
@@ -259,8 +397,12 @@ def analyze_image():
         # Analiz yap
         start_time = datetime.utcnow()
         
-        wave_result = wave_analyzer.analyze_wave_intensity(image)
-        people_result = people_detector.detect_people(image)
+        # Dalga analizi ve insan tespiti paralel çalışır
+        wave_future = EXECUTOR.submit(analysis_engine.wave_analyzer.analyze_wave_intensity, image)
+        people_future = analysis_engine.people_detector.detect_people_async(image)
+        
+        wave_result = wave_future.result()
+        people_result = people_future.result()
         
         processing_time = (datetime.utcnow() - start_time).total_seconds()
         
@@ -326,14 +468,13 @@ def submit_camera_request():
 def get_pending_requests():
     """Bekleyen başvuruları getir (admin)"""
     try:
-        requests = db_manager.get_pending_requests()
-        request_list = [req.to_dict() for req in requests]
+        request_list = db_manager.list_pending_requests_dicts()
         
-        return jsonify({
+        return Response(orjson.dumps({
             'status': 'success',
             'requests': request_list,
             'count': len(request_list)
-        })
+        }), content_type='application/json')
         
     except Exception as e:
         return jsonify({
@@ -383,37 +524,7 @@ def update_request_status(request_id):
 def get_system_stats():
     """Sistem istatistiklerini getir"""
     try:
-        cameras = db_manager.get_all_cameras()
-        
-        # Aktif kamera sayısı
-        active_cameras = sum(1 for cam in cameras if cam.is_active)
-        
-        # Analiz eden kamera sayısı
-        analyzing_cameras = 0
-        for camera in cameras:
-            status = analysis_engine.get_camera_status(camera.camera_id)
-            if status.get('analyzing', False):
-                analyzing_cameras += 1
-        
-        # Son 24 saatteki analiz sayısı
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        total_analyses = 0
-        
-        for camera in cameras:
-            history = analysis_engine.get_analysis_history(camera.camera_id, 1000)
-            recent_analyses = [
-                h for h in history 
-                if datetime.fromisoformat(h['timestamp'].replace('Z', '+00:00')) > yesterday
-            ]
-            total_analyses += len(recent_analyses)
-        
-        stats = {
-            'total_cameras': len(cameras),
-            'active_cameras': active_cameras,
-            'analyzing_cameras': analyzing_cameras,
-            'analyses_last_24h': total_analyses,
-            'system_uptime': 'running'  # Basit uptime
-        }
+        stats = STATS_CACHE.get_or_set('stats', _compute_system_stats)
         
         return jsonify({
             'status': 'success',
@@ -427,6 +538,33 @@ def get_system_stats():
         }), 500
 
 
+def _compute_system_stats() -> Dict[str, Any]:
+    """Sistem istatistiklerini hesaplar"""
+    cameras = db_manager.get_all_cameras()
+    
+    # Aktif kamera sayısı
+    active_cameras = sum(1 for cam in cameras if cam.is_active)
+    
+    # Analiz eden kamera sayısı (durumlar toplu alınır)
+    statuses = analysis_engine.get_all_camera_statuses()
+    analyzing_cameras = sum(
+        1 for camera in cameras
+        if statuses.get(camera.camera_id, {}).get('analyzing', False)
+    )
+    
+    # Son 24 saatteki analiz sayısı (timestamp indeksi üzerinden tek COUNT sorgusu)
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    total_analyses = db_manager.count_since(yesterday, [camera.camera_id for camera in cameras])
+    
+    return {
+        'total_cameras': len(cameras),
+        'active_cameras': active_cameras,
+        'analyzing_cameras': analyzing_cameras,
+        'analyses_last_24h': total_analyses,
+        'system_uptime': 'running'  # Basit uptime
+    }
+
+
 # Hata yakalama
 @app.errorhandler(404)
 def not_found(error):
@@ -436,6 +574,14 @@ def not_found(error):
     }), 404
 
 
+@app.errorhandler(413)
+def payload_too_large(error):
+    return jsonify({
+        'status': 'error',
+        'message': 'Dosya boyutu çok büyük'
+    }), 413
+
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({
@@ -444,11 +590,13 @@ def internal_error(error):
     }), 500
 
 
-if __name__ == '__main__':
-    # Veritabanı tablolarını oluştur
-    db_manager.create_tables()
+def seed_sample_cameras():
+    """
+    Geliştirme için örnek kameraları ekler (sadece DEBUG geliştirme sunucusunda)
     
-    # Örnek kameralar ekle (test için)
+    Üretimde çağrılmaz: sabit yerel IP'ler veritabanına yazılır ve her
+    kameraya bağlantı denemesi açılışı geciktirir.
+    """
     sample_cameras = [
         {
             'camera_id': 'karasu_1',
@@ -483,7 +631,22 @@ if __name__ == '__main__':
                 camera_data['ip_address'],
                 camera_data['port']
             )
-    
-    # Flask uygulamasını başlat
+
+
+if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
+    
+    if os.environ.get('DEBUG', 'False').lower() == 'true':
+        # Geliştirme sunucusu
+        db_manager.create_tables()
+        seed_sample_cameras()
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        # Üretim: gunicorn (gthread) ile çalıştır, ayarlar gunicorn.conf.py içinde
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        os.execvp('gunicorn', [
+            'gunicorn',
+            '--chdir', base_dir,
+            '-c', os.path.join(base_dir, 'gunicorn.conf.py'),
+            'api:app'
+        ])
@@ -0,0 +1,36 @@
+"""
+Batch Toplama Modülü
+
+Bu modül kuyruktan gelen işleri kısa bir zaman penceresi içinde
+gruplayarak toplu işlenmelerini sağlar.
+"""
+
+import queue
+import time
+
+
+def collect_batch(q: queue.Queue, max_size: int, timeout: float) -> list:
+    """
+    İlk öğeyi bekler, ardından batch dolana veya süre dolana kadar toplar
+    
+    Args:
+        q: Öğelerin okunacağı kuyruk
+        max_size: Maksimum batch boyutu
+        timeout: İlk öğeden sonra beklenecek en uzun süre (saniye)
+        
+    Returns:
+        En az bir öğe içeren batch
+    """
+    batch = [q.get()]
+    
+    deadline = time.monotonic() + timeout
+    while len(batch) < max_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    
+    return batch
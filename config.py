@@ -5,6 +5,7 @@ Bu dosya uygulama ayarlarını içerir.
 """
 
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
@@ -23,6 +24,7 @@ class Config:
     # Sunucu ayarları
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
+    MAX_UPLOAD_MB = int(os.getenv('MAX_UPLOAD_MB', 16))  # /api/analyze yükleme sınırı
     
     # Analiz ayarları
     ANALYSIS_INTERVAL = int(os.getenv('ANALYSIS_INTERVAL', 5))  # saniye
@@ -87,8 +89,8 @@ class Config:
         }
     ]
     
-    # Dalga yoğunluk seviyeleri
-    WAVE_INTENSITY_LEVELS = [
+    # Dalga yoğunluk seviyeleri (seviye numarasına göre salt okunur sözlük)
+    _WAVE_INTENSITY_LEVELS = (
         {
             'level': 0,
             'name': 'Sakin',
@@ -124,10 +126,11 @@ class Config:
             'color': '#FF0000',
             'safety': 'Tehlikeli'
         }
-    ]
+    )
+    WAVE_INTENSITY_LEVELS = MappingProxyType({level['level']: level for level in _WAVE_INTENSITY_LEVELS})
     
-    # Kalabalık seviyeleri
-    CROWD_LEVELS = [
+    # Kalabalık seviyeleri (seviye adına göre salt okunur sözlük)
+    _CROWD_LEVELS = (
         {
             'level': 'Boş',
             'description': 'Hiç kimse görünmüyor, güvenli',
@@ -158,7 +161,8 @@ class Config:
             'color': '#FF0000',
             'max_people': 999
         }
-    ]
+    )
+    CROWD_LEVELS = MappingProxyType({level['level']: level for level in _CROWD_LEVELS})
 
 
 # Konfigürasyon örneği
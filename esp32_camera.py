@@ -4,13 +4,30 @@ ESP32-CAM Entegrasyon Modülü
 Bu modül ESP32-CAM'den görüntü almak ve yönetmek için kullanılır.
 """
 
-import cv2
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
-from typing import Optional, Dict, Any
-import time
+from typing import Optional, Dict, Any, List, Tuple
 import threading
+import time
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+from jpeg_codec import decode_jpeg
+
+
+# Toplu kamera eklemede aynı anda test edilen bağlantı sayısı
+CONNECT_WORKERS = 32
+
+# MJPEG stream ayrıştırma ayarları
+JPEG_SOI = b'\xff\xd8'  # JPEG başlangıç işareti
+JPEG_EOI = b'\xff\xd9'  # JPEG bitiş işareti
+STREAM_CHUNK_SIZE = 4096
+STREAM_MAX_BUFFER = 2 * 1024 * 1024  # bitiş işareti gelmeden büyüyen tampon atılır
+
+# Son başarılı iletişimden bu kadar saniye geçmediyse kamera bağlı sayılır
+CONNECTED_TTL = 10
 
 
 class ESP32Camera:
@@ -40,10 +57,24 @@ class ESP32Camera:
         if username and password:
             self.auth = (username, password)
         
+        # Kalıcı HTTP oturumu: bağlantılar keep-alive ile yeniden kullanılır
+        self.http = requests.Session()
+        self.http.auth = self.auth
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                              max_retries=Retry(total=2, backoff_factor=0.1))
+        self.http.mount("http://", adapter)
+        
+        # Son başarılı iletişim zamanı (time.monotonic); hiç olmadıysa None
+        self._last_ok_ts: Optional[float] = None
+        
         # Stream durumu
         self.is_streaming = False
         self.stream_thread = None
-        self.current_frame = None
+        self._latest_jpeg: Optional[bytes] = None  # Çözülmemiş en son frame
+        self._jpeg_seq = 0  # Her yeni JPEG'de artar
+        
+        # Son çözülen frame (sıra numarası, salt okunur dizi); aynı JPEG tekrar çözülmez
+        self._decoded: Tuple[int, Optional[np.ndarray]] = (-1, None)
         self.frame_lock = threading.Lock()
         
     def test_connection(self) -> Dict[str, Any]:
@@ -55,9 +86,10 @@ class ESP32Camera:
         """
         try:
             # Basit bir HTTP isteği gönder
-            response = requests.get(self.base_url, timeout=5, auth=self.auth)
+            response = self.http.get(self.base_url, timeout=5)
             
             if response.status_code == 200:
+                self._last_ok_ts = time.monotonic()
                 return {
                     'status': 'success',
                     'message': 'ESP32-CAM bağlantısı başarılı',
@@ -95,13 +127,12 @@ class ESP32Camera:
             Çekilen görüntü (numpy array) veya None
         """
         try:
-            response = requests.get(self.snapshot_url, timeout=10, auth=self.auth)
+            response = self.http.get(self.snapshot_url, timeout=10)
             
             if response.status_code == 200:
-                # JPEG verisini numpy array'e çevir
-                image_array = np.frombuffer(response.content, dtype=np.uint8)
-                image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-                return image
+                self._last_ok_ts = time.monotonic()
+                # JPEG verisini numpy array'e çevir (varsa libjpeg-turbo ile)
+                return decode_jpeg(response.content)
             else:
                 print(f"Fotoğraf çekme hatası: HTTP {response.status_code}")
                 return None
@@ -138,42 +169,104 @@ class ESP32Camera:
             self.stream_thread.join(timeout=2)
     
     def _stream_worker(self):
-        """Stream worker thread"""
+        """
+        Stream worker thread
+        
+        MJPEG yanıtı doğrudan okunur, JPEG başlangıç/bitiş işaretleri arasındaki
+        son tam frame saklanır. Çözme işlemi sadece frame istendiğinde yapılır;
+        tüketici yavaşsa aradaki frame'ler çözülmeden atlanır.
+        """
         try:
-            # OpenCV VideoCapture kullanarak stream'i aç
-            stream_url = f"http://{self.ip_address}:{self.port}/stream"
-            cap = cv2.VideoCapture(stream_url)
+            response = self.http.get(self.stream_url, stream=True, timeout=10)
             
-            if not cap.isOpened():
-                print("Stream açılamadı")
+            if response.status_code != 200:
+                print(f"Stream açılamadı: HTTP {response.status_code}")
+                response.close()
                 self.is_streaming = False
                 return
             
-            while self.is_streaming:
-                ret, frame = cap.read()
-                if ret:
-                    with self.frame_lock:
-                        self.current_frame = frame.copy()
-                else:
-                    time.sleep(0.1)
-            
-            cap.release()
+            buffer = bytearray()
+            with response:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    if not self.is_streaming:
+                        break
+                    
+                    buffer += chunk
+                    latest = self._extract_latest_jpeg(buffer)
+                    if latest is not None:
+                        with self.frame_lock:
+                            self._latest_jpeg = latest
+                            self._jpeg_seq += 1
+                        self._last_ok_ts = time.monotonic()
+                    elif len(buffer) > STREAM_MAX_BUFFER:
+                        buffer.clear()
             
         except Exception as e:
             print(f"Stream worker hatası: {e}")
             self.is_streaming = False
     
-    def get_current_frame(self) -> Optional[np.ndarray]:
+    @staticmethod
+    def _extract_latest_jpeg(buffer: bytearray) -> Optional[bytes]:
+        """
+        Tampondaki tam JPEG'leri ayıklar, en sonuncusunu döner
+        
+        Tüketilen baytlar tampondan silinir, yarım kalan frame tamponda kalır.
+        
+        Args:
+            buffer: Stream'den okunan baytlar
+            
+        Returns:
+            En son tam JPEG veya tam frame yoksa None
+        """
+        latest = None
+        while True:
+            start = buffer.find(JPEG_SOI)
+            if start == -1:
+                # İşaret iki parçaya bölünmüş olabilir, son bayt tutulur
+                del buffer[:-1]
+                return latest
+            
+            end = buffer.find(JPEG_EOI, start + 2)
+            if end == -1:
+                del buffer[:start]
+                return latest
+            
+            latest = bytes(buffer[start:end + 2])
+            del buffer[:end + 2]
+    
+    def get_current_frame(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Mevcut frame'i döner
         
+        Args:
+            out: Frame'in kopyalanacağı yazılabilir tampon (verilmezse veya boyutu
+                 uymazsa kopya yapılmaz)
+        
         Returns:
-            Mevcut frame veya None
+            Mevcut frame veya None. out kullanılmadıysa dönen dizi kameranın
+            önbelleğidir ve salt okunurdur.
         """
         with self.frame_lock:
-            if self.current_frame is not None:
-                return self.current_frame.copy()
+            jpeg, seq = self._latest_jpeg, self._jpeg_seq
+            decoded_seq, frame = self._decoded
+        if jpeg is None:
             return None
+        
+        if decoded_seq != seq:
+            # Kilit dışında çözülür, stream thread'i beklemez
+            frame = decode_jpeg(jpeg)
+            if frame is None:
+                return None
+            frame.setflags(write=False)
+            with self.frame_lock:
+                if seq > self._decoded[0]:
+                    self._decoded = (seq, frame)
+        
+        if out is not None and out.flags.writeable \
+                and out.shape == frame.shape and out.dtype == frame.dtype:
+            np.copyto(out, frame)
+            return out
+        return frame
     
     def set_camera_settings(self, settings: Dict[str, Any]) -> bool:
         """
@@ -186,11 +279,10 @@ class ESP32Camera:
             Başarı durumu
         """
         try:
-            response = requests.post(
+            response = self.http.post(
                 self.control_url,
                 json=settings,
-                timeout=5,
-                auth=self.auth
+                timeout=5
             )
             
             return response.status_code == 200
@@ -208,7 +300,7 @@ class ESP32Camera:
         """
         try:
             info_url = urljoin(self.base_url, "info")
-            response = requests.get(info_url, timeout=5, auth=self.auth)
+            response = self.http.get(info_url, timeout=5)
             
             if response.status_code == 200:
                 return response.json()
@@ -228,9 +320,20 @@ class ESP32Camera:
         """
         Kamera bağlantı durumunu kontrol eder
         
+        Stream veya fotoğraf isteklerinden gelen son başarı zamanı kullanılır;
+        HTTP yoklaması sadece stream çalışmıyorsa ve yakın zamanda başarılı
+        iletişim olmadıysa yapılır.
+        
         Returns:
             Bağlantı durumu
         """
+        last_ok = self._last_ok_ts
+        if last_ok is not None and time.monotonic() - last_ok < CONNECTED_TTL:
+            return True
+        if self.is_streaming and last_ok is not None:
+            # Stream açık ama frame gelmiyor
+            return False
+        
         result = self.test_connection()
         return result['status'] == 'success'
 
@@ -270,6 +373,44 @@ class CameraManager:
             print(f"Kamera ekleme hatası: {e}")
             return False
     
+    def add_cameras_bulk(self, cameras: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """
+        Birden fazla kamerayı bağlantılarını paralel test ederek ekler
+        
+        Args:
+            cameras: Kamera bilgileri (camera_id, ip_address, port, username, password)
+            
+        Returns:
+            Kamera ID'sine göre bağlantı başarı durumu
+        """
+        if not cameras:
+            return {}
+        
+        def connect(camera_data: Dict[str, Any]) -> Optional[ESP32Camera]:
+            try:
+                camera = ESP32Camera(
+                    camera_data['ip_address'],
+                    camera_data.get('port', 80),
+                    camera_data.get('username'),
+                    camera_data.get('password')
+                )
+                if camera.test_connection()['status'] == 'success':
+                    return camera
+            except Exception as e:
+                print(f"Kamera ekleme hatası: {e}")
+            return None
+        
+        # Bağlantı beklemeleri üst üste biner: toplam süre en yavaş kamera kadar
+        with ThreadPoolExecutor(max_workers=min(CONNECT_WORKERS, len(cameras))) as pool:
+            connected = list(pool.map(connect, cameras))
+        
+        results = {}
+        for camera_data, camera in zip(cameras, connected):
+            if camera is not None:
+                self.cameras[camera_data['camera_id']] = camera
+            results[camera_data['camera_id']] = camera is not None
+        return results
+    
     def remove_camera(self, camera_id: str):
         """Kamerayı kaldırır"""
         if camera_id in self.cameras:
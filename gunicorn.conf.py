@@ -0,0 +1,38 @@
+"""
+Gunicorn Konfigürasyonu
+
+REST API'yi gthread worker'ları ile çalıştırır. Analiz motoru kamera
+pipeline'larını süreç içinde tuttuğu için varsayılan olarak tek worker
+kullanılır; eşzamanlılık worker başına thread'lerle sağlanır.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+worker_class = 'gthread'
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 120
+
+# Uygulama master süreçte bir kez yüklenir, YOLO modeli worker'lara fork ile paylaşılır
+# (model CPU'da yüklenir; CUDA sorgusu ve cihaza taşıma worker'da ilk çıkarımda yapılır)
+preload_app = True
+
+
+def on_starting(server):
+    """Master süreçte veritabanı tablolarını bir kez oluşturur"""
+    from database import db_manager
+    db_manager.create_tables()
+
+
+def post_fork(server, worker):
+    """Worker'da fork ile bozulan süreç durumunu yeniler"""
+    import api
+    from database import engine
+    
+    # Log dinleyici thread'i fork'ta kaybolur
+    api.log_listener = api.configure_logging()
+    
+    # Master'dan kalan bağlantılar kapatılmadan bırakılır, worker kendi bağlantılarını açar
+    engine.dispose(close=False)
@@ -0,0 +1,76 @@
+"""
+JPEG Kodlama Modülü
+
+Bu modül frame'leri JPEG olarak kodlar ve çözer. Kuruluysa SIMD destekli
+libjpeg-turbo (PyTurboJPEG) kullanılır, değilse OpenCV'ye düşülür.
+"""
+
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo = TurboJPEG()
+except Exception:
+    # Paket veya libturbojpeg kütüphanesi yoksa OpenCV kullanılır
+    _turbo = None
+    log.info("TurboJPEG bulunamadı, JPEG işlemleri OpenCV ile yapılacak")
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = 85) -> bytes:
+    """
+    BGR frame'i bellekte JPEG'e kodlar
+    
+    Args:
+        frame: Kodlanacak BGR frame
+        quality: JPEG kalitesi (0-100)
+        
+    Returns:
+        JPEG baytları
+    """
+    if _turbo is not None:
+        return _turbo.encode(frame, quality=quality, pixel_format=TJPF_BGR)
+    
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("JPEG kodlama başarısız")
+    return buffer.tobytes()
+
+
+def write_jpeg(path: str, frame: np.ndarray, quality: int = 85):
+    """
+    Frame'i JPEG olarak dosyaya yazar
+    
+    Args:
+        path: Dosya yolu
+        frame: Yazılacak BGR frame
+        quality: JPEG kalitesi (0-100)
+    """
+    jpeg_bytes = encode_jpeg(frame, quality)
+    with open(path, 'wb') as f:
+        f.write(jpeg_bytes)
+
+
+def decode_jpeg(data: bytes) -> Optional[np.ndarray]:
+    """
+    JPEG baytlarını BGR frame'e çözer
+    
+    Args:
+        data: JPEG baytları
+        
+    Returns:
+        BGR frame veya çözülemezse None
+    """
+    if _turbo is not None:
+        try:
+            return _turbo.decode(data, pixel_format=TJPF_BGR)
+        except Exception:
+            # Bozuk veya kesik JPEG: libjpeg-turbo hata verir, OpenCV gibi None dön
+            return None
+    
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
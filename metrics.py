@@ -0,0 +1,53 @@
+"""
+Metrik Modülü
+
+Bu modül analiz hattının kuyruk derinliklerini, atılan frame sayılarını
+ve aşama sürelerini Prometheus formatında sunmak için metrikleri tanımlar.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# Aşama süreleri
+ANALYSIS_WAVE_SECONDS = Histogram(
+    'analysis_wave_seconds',
+    'Tek frame dalga analizi süresi (saniye)'
+)
+ANALYSIS_PEOPLE_SECONDS = Histogram(
+    'analysis_people_seconds',
+    'Tek batch insan tespiti süresi (saniye)'
+)
+PEOPLE_BATCH_SIZE = Histogram(
+    'analysis_people_batch_size',
+    'Tek YOLO çağrısında işlenen frame sayısı',
+    buckets=(1, 2, 4, 8, 16)
+)
+DB_WRITE_SECONDS = Histogram(
+    'db_write_seconds',
+    'Toplu analiz kaydı veritabanı yazma süresi (saniye)'
+)
+
+# Kuyruk derinlikleri
+CAPTURE_QUEUE_DEPTH = Gauge(
+    'capture_queue_depth',
+    'Analiz bekleyen frame sayısı',
+    ['camera_id']
+)
+PERSIST_QUEUE_DEPTH = Gauge(
+    'persist_queue_depth',
+    'Kaydedilmeyi bekleyen analiz sonucu sayısı'
+)
+
+# Atılan frame'ler
+FRAMES_DROPPED = Counter(
+    'frames_dropped_total',
+    'Kuyruk dolduğu veya tampon bulunamadığı için atılan frame sayısı',
+    ['camera_id', 'reason']
+)
+
+# Sahne değişmediği için atlanan analizler
+ANALYSES_SKIPPED = Counter(
+    'analyses_skipped_total',
+    'Frame farkı eşik altında kaldığı için önceki sonucu kullanan analiz sayısı',
+    ['camera_id']
+)
@@ -4,97 +4,289 @@
 Bu modül görüntüdeki insanları tespit eder ve kalabalık seviyesini analiz eder.
 """
 
+import bisect
 import cv2
 import numpy as np
 from typing import Dict, List, Tuple, Any
 from ultralytics import YOLO
 import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from batching import collect_batch
+import metrics
+
+
+# Batch çıkarım ayarları: bu pencere içinde gelen frame'ler (kameralar ve API)
+# tek YOLO çağrısında işlenir
+BATCH_SIZE = 8
+BATCH_WINDOW = 0.05  # saniye
+
+# Modelin giriş boyutu; büyük frame'ler modele verilmeden önce bu boyuta küçültülür
+MODEL_IMGSZ = 640
+
+
+def _cuda_available() -> bool:
+    """CUDA destekli GPU var mı"""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+# Kalabalık seviyesi eşikleri (skor bu değerlerin altındaysa önceki seviye)
+_CROWD_LEVEL_THRESHOLDS = (2, 4, 6, 8)
+_CROWD_LEVEL_LABELS = ("Boş", "Az Kalabalık", "Orta Kalabalık", "Kalabalık", "Çok Kalabalık")
+
+
+def _crowd_score(people_count: int) -> float:
+    """İnsan sayısından kalabalık skorunu (0-10 arası) hesaplar"""
+    if people_count == 0:
+        return 0
+    elif people_count <= 5:
+        return min(people_count * 1.5, 5)
+    elif people_count <= 15:
+        return 5 + (people_count - 5) * 0.5
+    else:
+        return 10
+
+
+# İnsan sayısı → (yuvarlanmış skor, seviye); 15 kişiden sonra sonuç değişmez
+_CROWD_LUT_MAX = 16
+_CROWD_LUT = tuple(
+    (round(score, 2), _CROWD_LEVEL_LABELS[bisect.bisect_right(_CROWD_LEVEL_THRESHOLDS, score)])
+    for score in map(_crowd_score, range(_CROWD_LUT_MAX + 1))
+)
 
 
 class PeopleDetector:
     """İnsan tespiti ve kalabalık analizi sınıfı"""
     
+    # Yüklenen modeller tüm örnekler arasında paylaşılır (model yolu → YOLO)
+    _models: Dict[str, YOLO] = {}
+    _models_lock = threading.Lock()
+    
+    # YOLO modeli eşzamanlı çağrılar için thread-safe değil
+    _inference_lock = threading.Lock()
+    
     def __init__(self, model_path: str = None):
         """
         Args:
-            model_path: YOLO model dosyasının yolu (None ise varsayılan kullanılır)
+            model_path: YOLO model dosyasının yolu (None ise YOLO_MODEL_PATH ortam
+                        değişkeni, o da yoksa varsayılan model kullanılır).
+                        OpenVINO/ONNX olarak dışa aktarılmış modeller de verilebilir.
         """
         self.model = None
-        self.initialize_model(model_path)
+        
+        # FP16 kararı ilk çıkarımda verilir; CUDA sorgusu import/preload
+        # sırasında (gunicorn master'da fork öncesi) yapılırsa worker'larda
+        # CUDA kullanılamaz
+        self.half = None
+        
+        # Batch kuyruğu; işçi thread ilk kullanımda başlatılır (fork sonrası güvenli)
+        self._batch_q = queue.Queue()
+        self._batch_thread = None
+        self._batch_thread_lock = threading.Lock()
+        
+        self.initialize_model(model_path or os.getenv('YOLO_MODEL_PATH'))
         
     def initialize_model(self, model_path: str = None):
-        """YOLO modelini başlatır"""
+        """YOLO modelini başlatır (aynı model bir kez yüklenir)"""
+        if not (model_path and os.path.exists(model_path)):
+            # Varsayılan YOLO modelini kullan
+            model_path = 'yolov8n.pt'
+        
         try:
-            if model_path and os.path.exists(model_path):
-                self.model = YOLO(model_path)
-            else:
-                # Varsayılan YOLO modelini kullan
-                self.model = YOLO('yolov8n.pt')
-            print("YOLO modeli başarıyla yüklendi")
+            with PeopleDetector._models_lock:
+                model = PeopleDetector._models.get(model_path)
+                if model is None:
+                    model = YOLO(model_path)
+                    PeopleDetector._models[model_path] = model
+                    print("YOLO modeli başarıyla yüklendi")
+            # Model CPU'da yüklenir, cihaza ilk çıkarımda (fork sonrası) taşınır
+            self.model = model
         except Exception as e:
             print(f"Model yükleme hatası: {e}")
             self.model = None
     
-    def detect_people(self, frame: np.ndarray) -> Dict[str, Any]:
+    def detect_people(self, frame: np.ndarray, *, small: np.ndarray = None) -> Dict[str, Any]:
         """
         Frame'deki insanları tespit eder
         
         Args:
             frame: Analiz edilecek frame
+            small: Önceden küçültülmüş frame (verilirse model bunun üzerinde
+                   çalışır, kutular orijinal boyuta ölçeklenir)
             
         Returns:
             Tespit sonuçları sözlüğü
         """
+        return self.detect_people_async(frame, small=small).result()
+    
+    def detect_people_async(self, frame: np.ndarray, *, small: np.ndarray = None) -> Future:
+        """
+        Frame'i batch kuyruğuna ekler
+        
+        Kısa pencere içinde gelen diğer frame'lerle birlikte tek YOLO
+        çağrısında işlenir. Frame sonuç gelene kadar değiştirilmemelidir.
+        
+        Args:
+            frame: Analiz edilecek frame
+            small: Önceden küçültülmüş frame
+            
+        Returns:
+            Tespit sonuçları sözlüğünü verecek Future
+        """
+        self._ensure_batch_worker()
+        future = Future()
+        self._batch_q.put((frame, small, future))
+        return future
+    
+    def _ensure_batch_worker(self):
+        """Batch işçi thread'ini gerekirse başlatır"""
+        with self._batch_thread_lock:
+            if self._batch_thread is None or not self._batch_thread.is_alive():
+                self._batch_thread = threading.Thread(target=self._batch_worker, daemon=True)
+                self._batch_thread.start()
+    
+    def _batch_worker(self):
+        """Kuyruktaki frame'leri toplayıp tek YOLO çağrısında işler"""
+        while True:
+            batch = collect_batch(self._batch_q, BATCH_SIZE, BATCH_WINDOW)
+            
+            frames = [frame for frame, _, _ in batch]
+            smalls = [small for _, small, _ in batch]
+            try:
+                metrics.PEOPLE_BATCH_SIZE.observe(len(frames))
+                with metrics.ANALYSIS_PEOPLE_SECONDS.time():
+                    results = self.detect_people_batch(frames, smalls)
+            except Exception as e:
+                # Bekleyenler asılı kalmasın, hata kendilerine iletilir
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            # Sonuçları bekleyenlere dağıt
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+    
+    def detect_people_batch(self, frames: List[np.ndarray],
+                            smalls: List[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Birden fazla frame'deki insanları tek YOLO çağrısıyla tespit eder
+        
+        Args:
+            frames: Analiz edilecek frame listesi
+            smalls: Her frame için önceden küçültülmüş frame (None olanlar
+                    için orijinal frame kullanılır)
+            
+        Returns:
+            Her frame için tespit sonuçları sözlüğü (aynı sırada)
+        """
         if self.model is None:
-            return {
+            return [{
                 'people_count': 0,
                 'crowd_level': 'Bilinmiyor',
                 'crowd_score': 0,
                 'detections': [],
                 'error': 'Model yüklenemedi'
-            }
+            } for _ in frames]
+        
+        if smalls is None:
+            smalls = [None] * len(frames)
+        inputs = [self._fit_to_model(frame) if small is None else small
+                  for frame, small in zip(frames, smalls)]
         
         try:
-            # YOLO ile tespit yap
-            results = self.model(frame, classes=[0])  # Sadece person sınıfı (class 0)
-            
-            detections = []
-            people_count = 0
-            
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Sadece yüksek güvenilirlikli tespitleri al
-                        if box.conf[0] > 0.5:
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                            confidence = box.conf[0].cpu().numpy()
-                            
-                            detections.append({
-                                'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                                'confidence': float(confidence)
-                            })
-                            people_count += 1
+            # YOLO ile tespit yap (tüm frame'ler tek forward pass'te)
+            with self._inference_lock:
+                if self.half is None:
+                    # GPU varsa FP16 çıkarım (CPU'da ultralytics half'i yok sayar)
+                    self.half = _cuda_available()
+                
+                # Sadece person sınıfı (class 0)
+                results = self.model(inputs, classes=[0], half=self.half,
+                                     imgsz=MODEL_IMGSZ, verbose=False)
             
-            # Kalabalık seviyesi analizi
-            crowd_analysis = self._analyze_crowd_level(people_count, frame.shape)
-            
-            return {
-                'people_count': people_count,
-                'crowd_level': crowd_analysis['level'],
-                'crowd_score': crowd_analysis['score'],
-                'detections': detections,
-                'error': None
-            }
+            return [
+                self._summarize_detections(result, frame.shape, model_input.shape)
+                for result, frame, model_input in zip(results, frames, inputs)
+            ]
             
         except Exception as e:
-            return {
+            return [{
                 'people_count': 0,
                 'crowd_level': 'Hata',
                 'crowd_score': 0,
                 'detections': [],
                 'error': str(e)
-            }
+            } for _ in frames]
+    
+    @staticmethod
+    def _fit_to_model(frame: np.ndarray) -> np.ndarray:
+        """
+        Frame'i uzun kenarı model giriş boyutunu aşmayacak şekilde küçültür
+        
+        Model zaten bu boyutta çalışır; önceden küçültmek kopyalanan ve
+        letterbox'a giren piksel sayısını azaltır. Kutular _summarize_detections
+        içinde orijinal boyuta ölçeklenir.
+        """
+        height, width = frame.shape[:2]
+        scale = MODEL_IMGSZ / max(height, width)
+        if scale >= 1:
+            return frame
+        return cv2.resize(frame, (int(width * scale), int(height * scale)),
+                          interpolation=cv2.INTER_LINEAR)
+    
+    def _summarize_detections(self, result, frame_shape: Tuple[int, int, int],
+                              input_shape: Tuple[int, int, int]) -> Dict[str, Any]:
+        """
+        Tek bir YOLO sonucunu tespit sözlüğüne çevirir
+        
+        Args:
+            result: Frame'e ait YOLO sonucu
+            frame_shape: Orijinal frame boyutları
+            input_shape: Modele verilen frame'in boyutları
+            
+        Returns:
+            Tespit sonuçları sözlüğü
+        """
+        detections = []
+        people_count = 0
+        
+        # Kutuları orijinal frame boyutuna ölçekle
+        scale_x = frame_shape[1] / input_shape[1]
+        scale_y = frame_shape[0] / input_shape[0]
+        scale = np.array([scale_x, scale_y, scale_x, scale_y])
+        
+        boxes = result.boxes
+        if boxes is not None and len(boxes):
+            # Tüm kutular cihazdan tek seferde alınır
+            xyxy = boxes.xyxy.cpu().numpy()
+            conf = boxes.conf.cpu().numpy().astype(np.float32)
+            
+            # Sadece yüksek güvenilirlikli tespitleri al
+            mask = conf > 0.5
+            bboxes = (xyxy[mask] * scale).astype(np.int32)
+            
+            detections = [
+                {'bbox': bbox, 'confidence': confidence}
+                for bbox, confidence in zip(bboxes.tolist(), conf[mask].tolist())
+            ]
+            people_count = len(detections)
+        
+        # Kalabalık seviyesi analizi
+        crowd_analysis = self._analyze_crowd_level(people_count, frame_shape)
+        
+        return {
+            'people_count': people_count,
+            'crowd_level': crowd_analysis['level'],
+            'crowd_score': crowd_analysis['score'],
+            'detections': detections,
+            'error': None
+        }
     
     def _analyze_crowd_level(self, people_count: int, frame_shape: Tuple[int, int, int]) -> Dict[str, Any]:
         """
@@ -113,65 +305,54 @@ class PeopleDetector:
         # İnsan başına düşen alan (piksel)
         area_per_person = frame_area / max(people_count, 1)
         
-        # Kalabalık skoru (0-10 arası)
-        if people_count == 0:
-            crowd_score = 0
-        elif people_count <= 5:
-            crowd_score = min(people_count * 1.5, 5)
-        elif people_count <= 15:
-            crowd_score = 5 + (people_count - 5) * 0.5
-        else:
-            crowd_score = 10
-        
-        # Kalabalık seviyesi
-        if crowd_score < 2:
-            level = "Boş"
-        elif crowd_score < 4:
-            level = "Az Kalabalık"
-        elif crowd_score < 6:
-            level = "Orta Kalabalık"
-        elif crowd_score < 8:
-            level = "Kalabalık"
-        else:
-            level = "Çok Kalabalık"
+        # Skor ve seviye sadece insan sayısına bağlı, tablodan okunur
+        crowd_score, level = _CROWD_LUT[min(people_count, _CROWD_LUT_MAX)]
         
         return {
             'level': level,
-            'score': round(crowd_score, 2),
+            'score': crowd_score,
             'area_per_person': int(area_per_person)
         }
     
-    def draw_detections(self, frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, detections: List[Dict],
+                        show_confidence: bool = True) -> np.ndarray:
         """
         Tespit edilen insanları frame üzerine çizer
         
         Args:
             frame: Orijinal frame
             detections: Tespit sonuçları
+            show_confidence: Güvenilirlik skorları yazılsın mı
             
         Returns:
             Çizimli frame
         """
         result_frame = frame.copy()
+        if not detections:
+            return result_frame
         
-        for detection in detections:
-            bbox = detection['bbox']
-            confidence = detection['confidence']
-            
-            # Bounding box çiz
-            cv2.rectangle(result_frame, 
-                         (bbox[0], bbox[1]), 
-                         (bbox[2], bbox[3]), 
-                         (0, 255, 0), 2)
-            
-            # Güvenilirlik skorunu yaz
-            cv2.putText(result_frame, 
-                       f'{confidence:.2f}', 
-                       (bbox[0], bbox[1] - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.5, 
-                       (0, 255, 0), 
-                       2)
+        # Tüm bounding box'lar tek polylines çağrısıyla çizilir
+        bboxes = np.array([detection['bbox'] for detection in detections], dtype=np.int32)
+        x1, y1, x2, y2 = bboxes.T
+        corners = np.stack([
+            np.stack([x1, y1], axis=1),
+            np.stack([x2, y1], axis=1),
+            np.stack([x2, y2], axis=1),
+            np.stack([x1, y2], axis=1)
+        ], axis=1)
+        cv2.polylines(result_frame, list(corners), True, (0, 255, 0), 2)
+        
+        # Güvenilirlik skorlarını yaz
+        if show_confidence:
+            for detection in detections:
+                bbox = detection['bbox']
+                cv2.putText(result_frame, 
+                           f"{detection['confidence']:.2f}", 
+                           (bbox[0], bbox[1] - 10), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 
+                           0.5, 
+                           (0, 255, 0), 
+                           2)
         
         return result_frame
     
@@ -0,0 +1,63 @@
+"""
+Dalga Yoğunluğu Analizi Testleri
+
+Çalıştırma: python -m unittest test_wave_analyzer
+"""
+
+import unittest
+
+import numpy as np
+
+from wave_analyzer import WaveIntensityAnalyzer, _pattern_scores
+
+
+class TinyFrameTest(unittest.TestCase):
+    """Frekans bandı boş kalan küçük frame'ler hata vermeden 0 skor almalı"""
+
+    SHAPES = [(1, 1), (2, 2), (3, 7), (7, 3)]
+
+    def test_pattern_scores_empty_band(self):
+        for shape in self.SHAPES:
+            with self.subTest(shape=shape):
+                frames = np.full((2,) + shape, 128, dtype=np.uint8)
+                self.assertEqual(_pattern_scores(frames), [0.0, 0.0])
+
+    def test_analyze_tiny_gray_and_bgr(self):
+        for shape in self.SHAPES:
+            for channels in (None, 3):
+                full_shape = shape if channels is None else shape + (channels,)
+                with self.subTest(shape=full_shape):
+                    analyzer = WaveIntensityAnalyzer()
+                    frame = np.zeros(full_shape, dtype=np.uint8)
+                    analyzer.analyze_wave_intensity(frame)
+                    result = analyzer.analyze_wave_intensity(np.full(full_shape, 255, dtype=np.uint8))
+                    self.assertEqual(result['pattern_score'], 0.0)
+
+    def test_batch_tiny_frames(self):
+        analyzer = WaveIntensityAnalyzer()
+        frames = [np.full((1, 1, 3), value, dtype=np.uint8) for value in (0, 255, 0)]
+        results = analyzer.analyze_wave_intensity_batch(frames)
+        self.assertEqual([result['pattern_score'] for result in results], [0.0, 0.0, 0.0])
+
+    def test_regular_frame_still_scored(self):
+        rng = np.random.default_rng(0)
+        frames = rng.integers(0, 256, (1, 64, 64), dtype=np.uint8)
+        self.assertGreater(_pattern_scores(frames)[0], 0.0)
+
+
+class ReusedBufferTest(unittest.TestCase):
+    """Çağıranın yeniden kullandığı gri tampon önceki frame'i bozmamalı"""
+
+    def test_motion_with_reused_gray_buffer(self):
+        analyzer = WaveIntensityAnalyzer()
+        buffer = np.zeros((200, 200), dtype=np.uint8)
+        scores = []
+        for value in (0, 255, 0):
+            buffer[:] = value
+            scores.append(analyzer.analyze_wave_intensity(buffer)['motion_score'])
+        self.assertEqual(scores, [0.0, 10.0, 10.0])
+        self.assertFalse(np.shares_memory(analyzer.prev_frame, buffer))
+
+
+if __name__ == '__main__':
+    unittest.main()
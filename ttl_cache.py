@@ -0,0 +1,86 @@
+"""
+TTL Önbellek Modülü
+
+Bu modül kısa süre bayat kalabilecek veriler için thread-safe,
+süre sınırlı bir bellek içi önbellek sağlar.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Süre sınırlı, thread-safe önbellek sınıfı"""
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        """
+        Args:
+            ttl: Kayıtların geçerlilik süresi (saniye)
+            maxsize: Maksimum kayıt sayısı
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Geçerli kaydı döner, yoksa veya süresi dolmuşsa default döner"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Kaydı ekler veya günceller"""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Geçerli kaydı döner, yoksa factory ile üretip önbelleğe ekler
+
+        Args:
+            key: Önbellek anahtarı
+            factory: Kayıt yoksa değeri üreten fonksiyon
+
+        Returns:
+            Önbellekteki veya yeni üretilen değer
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Üretim kilit dışında yapılır, yavaş işlemler diğer okuyucuları bekletmez
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Kaydı önbellekten çıkarır"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self):
+        """Tüm kayıtları siler"""
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        """Süresi dolan kayıtları, yer açılmazsa en eski kaydı siler"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
@@ -6,8 +6,154 @@ Bu modül deniz dalgalarının yoğunluğunu 0-10 arası derecelendirir.
 
 import cv2
 import numpy as np
-from typing import Tuple, Dict, Any
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Tuple, Dict, Any, List, Optional
 import math
+import threading
+
+
+# Skorların son hesaplandığı karoya göre ortalama piksel farkı bunun
+# altındaysa (uint8) sahne değişmemiş sayılır, kenar ve pattern skorları
+# yeniden kullanılır. Karşılaştırma bir önceki frame ile değil referans
+# karo ile yapılır; yavaş değişimler (sis, gelgit, ışık) birikerek eşiği aşar.
+STATIC_DIFF_THRESHOLD = 2.0
+
+# Hareket skoru bunun altındaysa deniz düz sayılır, FFT atlanır ve
+# önceki pattern skoru her frame'de PATTERN_DECAY ile sönümlenir
+MOTION_EPS = 0.1
+PATTERN_DECAY = 0.9
+
+# Analizin yapıldığı karonun en uzun kenarı (piksel); aşağıdaki eşik ve
+# ölçekler bu boyuta göre ayarlıdır
+ANALYSIS_TILE_SIZE = 256
+
+# Hareketli sayılan minimum piksel farkı ve hareket oranının skor ölçeği.
+# output/tracked_waves.mp4 (her 25. frame) üzerinde eski 0.5 ölçekli karodaki
+# (eşik 30, ölçek 100) skora en yakın sonucu veren çift; INTER_AREA
+# küçültme farkları yumuşattığı için eşik daha düşüktür
+MOTION_THRESHOLD = 28
+MOTION_SCALE = 110
+
+# Kenar sayılan minimum Sobel gradyanı (|gx| + |gy|) ve kenar oranının
+# skor ölçeği; aynı klipte eski karodaki Canny(50, 150) * 50 skorunun
+# ortalamasını veren çift
+EDGE_THRESHOLD = 70
+EDGE_SCALE = 21.5
+
+# Ortalama yoğunluk için tutulan son frame sayısı
+HISTORY_SIZE = 30
+
+# Yoğunluk seviyeleri: eşikler artan sırada, her eşik bir üst seviyenin
+# alt sınırı; seviyeler (ad, açıklama) olarak eşiklerden bir fazla
+_INTENSITY_THRESHOLDS = (2, 4, 6, 8)
+_INTENSITY_LEVELS = (
+    ("Sakin", "Deniz çok sakin, dalga yok"),
+    ("Hafif Dalgalı", "Hafif dalgalar var, güvenli"),
+    ("Orta Dalgalı", "Orta şiddette dalgalar, dikkatli olun"),
+    ("Dalgalı", "Güçlü dalgalar, dikkat gerekli"),
+    ("Çok Dalgalı", "Çok güçlü dalgalar, tehlikeli"),
+)
+
+
+@lru_cache(maxsize=64)
+def _next_fast_len(n: int) -> int:
+    """n'den büyük veya eşit, sadece 2, 3 ve 5 çarpanlı en küçük FFT boyutunu döner"""
+    while True:
+        m = n
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+
+def _tile_size(height: int, width: int) -> Optional[Tuple[int, int]]:
+    """Karoya küçültme için (genişlik, yükseklik) döner, gerek yoksa None"""
+    scale = ANALYSIS_TILE_SIZE / max(height, width)
+    if scale >= 1:
+        return None
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def _to_small_gray(frame: np.ndarray) -> np.ndarray:
+    """Frame'i gri tonlamaya çevirir (BGR girdiler önce karoya küçültülür)"""
+    if len(frame.shape) == 3:
+        # Önce karoya küçültülür, renk dönüşümü az piksel üzerinde yapılır
+        size = _tile_size(*frame.shape[:2])
+        if size is not None:
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    # Tek kanallı girdi kopyalanır; çağıran aynı tamponu sonraki frame için
+    # yeniden kullanabilir, önceki frame analizörün kendi dizisinde kalmalı
+    return frame.copy()
+
+
+def _pattern_scores(frames: np.ndarray) -> List[float]:
+    """
+    Aynı boyutlu gri frame yığınının (N, H, W) pattern skorlarını hesaplar
+    
+    FFT tüm yığın için tek çağrıda yapılır.
+    """
+    # Boyutlar 2-3-5 çarpanlı en yakın değere sıfırla doldurulur,
+    # asal çarpanlı boyutlarda FFT yavaşlar
+    height, width = _next_fast_len(frames.shape[1]), _next_fast_len(frames.shape[2])
+    
+    # Çok küçük karolarda (ör. 1x1) incelenecek frekans bandı boş kalır
+    band = height // 4
+    if band == 0 or width // 4 == 0:
+        return [0.0] * len(frames)
+    
+    # Gerçek girdi için FFT: Hermitian simetri nedeniyle yarı spektrum yeterli
+    # (float32 girdi NumPy 2'de complex64 çıktı verir)
+    f_transform = np.fft.rfft2(frames.astype(np.float32, copy=False), s=(height, width), axes=(1, 2))
+    
+    # Merkez satır bandı (kaydırılmış spektrumda cy ± h/4) kaydırılmamış
+    # çıktıda ilk ve son h/4 satıra karşılık gelir; fftshift kopyası yerine
+    # bu iki bant doğrudan alınır. Sütunlar zaten 0'dan başlayan pozitif
+    # frekanslardır (tam spektrumdaki merkez bölgenin simetrik yarısı).
+    # Bölge complex64'e indirilir, genlik hesabı float32 üzerinde yapılır
+    # (NumPy 1.x FFT çıktısını complex128'e yükseltir).
+    region = np.concatenate((
+        f_transform[:, height - band:, :width//4],
+        f_transform[:, :band, :width//4]
+    ), axis=1, dtype=np.complex64)
+    
+    # Genlik için alpha-max-plus-beta-min yaklaşımı (karekök hesaplanmaz,
+    # hata ~%4, log sonrası varyansta ihmal edilebilir)
+    re = np.abs(region.real)
+    im = np.abs(region.imag)
+    magnitude = np.maximum(re, im)
+    magnitude *= 0.96
+    magnitude += 0.4 * np.minimum(re, im)
+    outer_region = np.log1p(magnitude, out=magnitude)
+    
+    scores = []
+    for spectrum in outer_region:
+        # Pattern skoru
+        # (ortalama ve standart sapma OpenCV ile tek geçişte hesaplanır)
+        _, stddev = cv2.meanStdDev(spectrum)
+        pattern_variance = stddev[0, 0] ** 2
+        scores.append(min(pattern_variance / 1000, 10.0))  # 0-10 arası
+    
+    return scores
+
+
+def _score_intensity(motion: float, edge: float, pattern: float) -> Tuple[float, str, str]:
+    """
+    Skorlardan toplam yoğunluğu, seviyeyi ve açıklamayı tek geçişte hesaplar
+    
+    Returns:
+        (toplam yoğunluk, seviye, açıklama)
+    """
+    # Ağırlıklı ortalama (hareket 0.4, kenar 0.3, pattern 0.3)
+    total = min(motion * 0.4 + edge * 0.3 + pattern * 0.3, 10.0)
+    
+    # Eşiğe eşit değer üst seviyeye girer (bisect_right)
+    level, description = _INTENSITY_LEVELS[bisect_right(_INTENSITY_THRESHOLDS, total)]
+    return total, level, description
 
 
 class WaveIntensityAnalyzer:
@@ -16,48 +162,188 @@ class WaveIntensityAnalyzer:
     def __init__(self):
         self.prev_frame = None
         self.frame_count = 0
-        self.intensity_history = []
         
-    def analyze_wave_intensity(self, frame: np.ndarray) -> Dict[str, Any]:
+        # Son HISTORY_SIZE yoğunluk için halka tampon ve toplam
+        self._history = np.zeros(HISTORY_SIZE)
+        self._history_idx = 0
+        self._history_len = 0
+        self._history_sum = 0.0
+        
+        # Değişmeyen sahnelerde yeniden kullanılan son skorlar ve hesaplandıkları karo
+        self._last_edge_score = None
+        self._last_pattern_score = None
+        self._score_ref = None
+        
+        # Karo ve fark görüntüleri için her frame'de yeniden ayrılmayan tamponlar
+        # (BGR karo sadece renk dönüşümüne kadar kullanılır, tek tampon yeterli)
+        self._tile_buffers = [None, None]
+        self._tile_idx = 0
+        self._bgr_buf = None
+        self._diff_buf = None
+        self._lock = threading.Lock()
+        
+        # Kenar analizi FFT ile paralel bu havuzda çalışır (ilk kullanımda oluşturulur)
+        self._edge_pool: Optional[ThreadPoolExecutor] = None
+        
+    def analyze_wave_intensity(self, frame: np.ndarray, *, gray: np.ndarray = None,
+                               small: np.ndarray = None) -> Dict[str, Any]:
         """
         Tek bir frame'deki dalga yoğunluğunu analiz eder
         
         Args:
             frame: Analiz edilecek frame
+            gray: Önceden küçültülmüş gri tonlamalı frame (verilirse
+                  renk dönüşümü atlanır)
+            small: Önceden küçültülmüş BGR frame
             
         Returns:
             Analiz sonuçları sözlüğü
         """
-        # Frame'i gri tonlamaya çevir
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame.copy()
+        # Tamponlar ve önceki frame paylaşıldığından aynı analizör üzerindeki
+        # eşzamanlı çağrılar sıraya alınır
+        with self._lock:
+            return self._analyze_tile(self._prepare_tile(frame, gray, small))
+    
+    def analyze_wave_intensity_batch(self, frames: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        Aynı kaynaktan gelen ardışık frame'leri tek seferde analiz eder
+        
+        Hareket skorları frame sırasıyla hesaplanır; sahnesi değişen
+        frame'lerin FFT'leri tek bir toplu rfft2 çağrısında yapılır.
+        
+        Args:
+            frames: Zaman sırasındaki BGR veya gri tonlamalı frame'ler
             
-        # Frame'i yeniden boyutlandır (performans için)
-        height, width = gray.shape
-        scale_factor = 0.5
-        small_gray = cv2.resize(gray, (int(width * scale_factor), int(height * scale_factor)))
+        Returns:
+            Her frame için analiz sonuçları sözlüğü (frame sırasıyla)
+        """
+        tiles = []
+        for frame in frames:
+            tile = _to_small_gray(frame)
+            size = _tile_size(*tile.shape)
+            if size is not None:
+                # Batch içindeki karolar birlikte tutulduğu için dönüşümlü tampon kullanılmaz
+                tile = cv2.resize(tile, size, interpolation=cv2.INTER_AREA)
+            tiles.append(tile)
         
+        with self._lock:
+            motions = [self._analyze_motion(tile) for tile in tiles]
+            
+            # Kenar analizi gereken frame'ler ve bunlardan FFT gerekenler
+            # (tekil analizdeki eşikler ile aynı)
+            changed = []
+            needs_fft = []
+            has_scores = self._last_edge_score is not None
+            for i, (tile, motion_score) in enumerate(zip(tiles, motions)):
+                if not has_scores or self._scene_changed(tile):
+                    changed.append(i)
+                    if not (has_scores and motion_score < MOTION_EPS):
+                        needs_fft.append(i)
+                    self._set_score_ref(tile)
+                    has_scores = True
+            
+            # Kenar analizleri havuzda, toplu FFT bu thread'de paralel yürür
+            pool = self._get_edge_pool()
+            edge_futures = {i: pool.submit(self._analyze_edges, tiles[i]) for i in changed}
+            fft_tiles = [tiles[i] for i in needs_fft]
+            if fft_tiles and all(tile.shape == fft_tiles[0].shape for tile in fft_tiles):
+                pattern_scores = _pattern_scores(np.stack(fft_tiles))
+            else:
+                pattern_scores = [self._analyze_wave_patterns(tile) for tile in fft_tiles]
+            pattern_scores = dict(zip(needs_fft, pattern_scores))
+            edge_scores = {i: future.result() for i, future in edge_futures.items()}
+            
+            results = []
+            for i, motion_score in enumerate(motions):
+                if i in edge_scores:
+                    self._last_edge_score = edge_scores[i]
+                    if i in pattern_scores:
+                        self._last_pattern_score = pattern_scores[i]
+                    else:
+                        # Deniz düz: önceki pattern skoru sönümlenir
+                        self._last_pattern_score *= PATTERN_DECAY
+                results.append(self._record_result(
+                    motion_score, self._last_edge_score, self._last_pattern_score))
+            return results
+    
+    def _prepare_tile(self, frame: np.ndarray, gray: np.ndarray = None,
+                      small: np.ndarray = None) -> np.ndarray:
+        """
+        Girdiyi kalıcı tamponlar üzerinde gri tonlamalı karoya çevirir (kilit altında çağrılır)
+        
+        Frame sabit boyutlu karoya küçültülür (FFT maliyeti ve skor ölçeği
+        giriş çözünürlüğünden bağımsız olur). BGR girdiler önce karoya
+        küçültülür, renk dönüşümü az piksel üzerinde yapılır.
+        """
+        source = gray if gray is not None else (small if small is not None else frame)
+        size = _tile_size(*source.shape[:2])
+        
+        if len(source.shape) == 3:
+            if size is not None:
+                shape = (size[1], size[0], source.shape[2])
+                if self._bgr_buf is None or self._bgr_buf.shape != shape \
+                        or self._bgr_buf.dtype != source.dtype:
+                    self._bgr_buf = np.empty(shape, source.dtype)
+                source = cv2.resize(source, size, dst=self._bgr_buf, interpolation=cv2.INTER_AREA)
+            return cv2.cvtColor(source, cv2.COLOR_BGR2GRAY,
+                                dst=self._next_tile_buffer(source.shape[:2], source.dtype))
+        
+        if size is not None:
+            return cv2.resize(source, size,
+                              dst=self._next_tile_buffer((size[1], size[0]), source.dtype),
+                              interpolation=cv2.INTER_AREA)
+        
+        # Tek kanallı ve zaten küçük girdi karo tamponuna kopyalanır; çağıran
+        # aynı tamponu sonraki frame için yeniden kullanabilir, prev_frame
+        # analizörün kendi dizisinde kalmalı
+        tile = self._next_tile_buffer(source.shape, source.dtype)
+        np.copyto(tile, source)
+        return tile
+    
+    def _analyze_tile(self, small_gray: np.ndarray) -> Dict[str, Any]:
+        """Gri karonun skorlarını hesaplar (kilit altında çağrılır)"""
         # Hareket analizi
         motion_score = self._analyze_motion(small_gray)
         
-        # Kenar analizi
-        edge_score = self._analyze_edges(small_gray)
-        
-        # Dalga pattern analizi
-        pattern_score = self._analyze_wave_patterns(small_gray)
+        if self._last_edge_score is not None and not self._scene_changed(small_gray):
+            # Sahne değişmedi: Canny ve FFT atlanır
+            edge_score = self._last_edge_score
+            pattern_score = self._last_pattern_score
+        else:
+            if motion_score < MOTION_EPS and self._last_pattern_score is not None:
+                # Deniz düz: FFT atlanır, önceki pattern skoru sönümlenir
+                edge_score = self._analyze_edges(small_gray)
+                pattern_score = self._last_pattern_score * PATTERN_DECAY
+            else:
+                # Kenar analizi ayrı thread'de, dalga pattern analizi (FFT) bu
+                # thread'de paralel yürür (OpenCV ve NumPy GIL'i bırakır)
+                edge_future = self._get_edge_pool().submit(self._analyze_edges, small_gray)
+                pattern_score = self._analyze_wave_patterns(small_gray)
+                edge_score = edge_future.result()
+            
+            self._last_edge_score = edge_score
+            self._last_pattern_score = pattern_score
+            self._set_score_ref(small_gray)
         
-        # Toplam yoğunluk hesaplama (0-10 arası)
-        total_intensity = self._calculate_total_intensity(motion_score, edge_score, pattern_score)
+        return self._record_result(motion_score, edge_score, pattern_score)
+    
+    def _record_result(self, motion_score: float, edge_score: float,
+                       pattern_score: float) -> Dict[str, Any]:
+        """Skorları birleştirip geçmişe ekler ve sonuç sözlüğünü döner"""
+        # Toplam yoğunluk (0-10 arası), seviye ve açıklama
+        total_intensity, intensity_level, description = _score_intensity(
+            motion_score, edge_score, pattern_score)
         
         # Sonucu geçmişe ekle
-        self.intensity_history.append(total_intensity)
-        if len(self.intensity_history) > 30:  # Son 30 frame'i tut
-            self.intensity_history.pop(0)
+        # (dolu tamponda üzerine yazılan en eski değer toplamdan düşülür)
+        idx = self._history_idx
+        self._history_sum += total_intensity - self._history[idx]
+        self._history[idx] = total_intensity
+        self._history_idx = (idx + 1) % HISTORY_SIZE
+        self._history_len = min(self._history_len + 1, HISTORY_SIZE)
             
         # Ortalama yoğunluk
-        avg_intensity = np.mean(self.intensity_history) if self.intensity_history else total_intensity
+        avg_intensity = self._history_sum / self._history_len
         
         return {
             'current_intensity': round(total_intensity, 2),
@@ -65,96 +351,89 @@ class WaveIntensityAnalyzer:
             'motion_score': round(motion_score, 2),
             'edge_score': round(edge_score, 2),
             'pattern_score': round(pattern_score, 2),
-            'intensity_level': self._get_intensity_level(total_intensity),
-            'description': self._get_intensity_description(total_intensity)
+            'intensity_level': intensity_level,
+            'description': description
         }
     
+    def _get_edge_pool(self) -> ThreadPoolExecutor:
+        """Kenar analizi havuzunu ilk kullanımda oluşturur (fork sonrası güvenli, kilit altında çağrılır)"""
+        if self._edge_pool is None:
+            self._edge_pool = ThreadPoolExecutor(max_workers=1)
+        return self._edge_pool
+    
+    def _next_tile_buffer(self, shape: Tuple[int, int], dtype) -> np.ndarray:
+        """
+        Sıradaki karo tamponunu döner
+        
+        İki tampon dönüşümlü kullanılır; önceki frame (prev_frame) diğer
+        tamponda kaldığı için üzerine yazılmaz.
+        """
+        buffers = self._tile_buffers
+        if buffers[0] is None or buffers[0].shape != shape or buffers[0].dtype != dtype:
+            buffers[0] = np.empty(shape, dtype)
+            buffers[1] = np.empty(shape, dtype)
+        self._tile_idx ^= 1
+        return buffers[self._tile_idx]
+    
     def _analyze_motion(self, frame: np.ndarray) -> float:
         """Hareket analizi yapar"""
-        if self.prev_frame is None:
+        if self.prev_frame is None or self.prev_frame.shape != frame.shape:
+            # İlk frame veya çözünürlük değişti: karşılaştırma tabanı yenilenir
             self.prev_frame = frame
             return 0.0
             
         # Frame farkını hesapla
-        frame_diff = cv2.absdiff(frame, self.prev_frame)
+        if self._diff_buf is None or self._diff_buf.shape != frame.shape \
+                or self._diff_buf.dtype != frame.dtype:
+            self._diff_buf = np.empty_like(frame)
+        frame_diff = cv2.absdiff(frame, self.prev_frame, dst=self._diff_buf)
         
         # Hareket miktarını hesapla
-        motion_pixels = np.sum(frame_diff > 30)  # Threshold
+        # (threshold eşiği skaler parametre alır; compare'de skaler küçük
+        # dizilerde dizi olarak yorumlanıp boyut hatası verir)
+        _, motion_mask = cv2.threshold(frame_diff, MOTION_THRESHOLD, 255, cv2.THRESH_BINARY)
+        motion_pixels = cv2.countNonZero(motion_mask)
         total_pixels = frame_diff.size
         
         motion_ratio = motion_pixels / total_pixels
-        motion_score = min(motion_ratio * 100, 10.0)  # 0-10 arası
+        motion_score = min(motion_ratio * MOTION_SCALE, 10.0)  # 0-10 arası
         
         self.prev_frame = frame
         return motion_score
     
+    def _scene_changed(self, frame: np.ndarray) -> bool:
+        """Karo, skorların son hesaplandığı karodan belirgin şekilde farklı mı"""
+        ref = self._score_ref
+        if ref is None or ref.shape != frame.shape:
+            return True
+        # Ortalama mutlak fark (ara dizi ayrılmadan)
+        return cv2.norm(frame, ref, cv2.NORM_L1) / frame.size >= STATIC_DIFF_THRESHOLD
+    
+    def _set_score_ref(self, frame: np.ndarray):
+        """Karoyu skor referansı olarak kopyalar (karo tamponları yeniden kullanıldığından)"""
+        if self._score_ref is None or self._score_ref.shape != frame.shape \
+                or self._score_ref.dtype != frame.dtype:
+            self._score_ref = np.empty_like(frame)
+        np.copyto(self._score_ref, frame)
+    
     def _analyze_edges(self, frame: np.ndarray) -> float:
         """Kenar analizi yapar"""
-        # Canny edge detection
-        edges = cv2.Canny(frame, 50, 150)
+        # Sobel gradyanı (|gx| + |gy|, Canny'nin L1 normu); sadece kenar
+        # yoğunluğu sayıldığı için Canny'nin inceltme ve histerezis adımları atlanır
+        grad_x = cv2.convertScaleAbs(cv2.Sobel(frame, cv2.CV_16S, 1, 0, ksize=3))
+        grad_y = cv2.convertScaleAbs(cv2.Sobel(frame, cv2.CV_16S, 0, 1, ksize=3))
+        magnitude = cv2.add(grad_x, grad_y)
         
         # Kenar yoğunluğu
-        edge_pixels = np.sum(edges > 0)
-        total_pixels = edges.size
+        _, edge_mask = cv2.threshold(magnitude, EDGE_THRESHOLD, 255, cv2.THRESH_BINARY)
+        edge_pixels = cv2.countNonZero(edge_mask)
+        total_pixels = magnitude.size
         
         edge_ratio = edge_pixels / total_pixels
-        edge_score = min(edge_ratio * 50, 10.0)  # 0-10 arası
+        edge_score = min(edge_ratio * EDGE_SCALE, 10.0)  # 0-10 arası
         
         return edge_score
     
     def _analyze_wave_patterns(self, frame: np.ndarray) -> float:
         """Dalga pattern analizi yapar"""
-        # FFT kullanarak frekans analizi
-        f_transform = np.fft.fft2(frame)
-        f_shift = np.fft.fftshift(f_transform)
-        magnitude_spectrum = np.log(np.abs(f_shift) + 1)
-        
-        # Yüksek frekans bileşenlerini analiz et
-        height, width = magnitude_spectrum.shape
-        center_y, center_x = height // 2, width // 2
-        
-        # Merkez dışındaki alanları analiz et
-        outer_region = magnitude_spectrum[
-            max(0, center_y - height//4):min(height, center_y + height//4),
-            max(0, center_x - width//4):min(width, center_x + width//4)
-        ]
-        
-        # Pattern skoru
-        pattern_variance = np.var(outer_region)
-        pattern_score = min(pattern_variance / 1000, 10.0)  # 0-10 arası
-        
-        return pattern_score
-    
-    def _calculate_total_intensity(self, motion: float, edge: float, pattern: float) -> float:
-        """Toplam yoğunluk hesaplar"""
-        # Ağırlıklı ortalama
-        weights = [0.4, 0.3, 0.3]  # Hareket, kenar, pattern ağırlıkları
-        total = motion * weights[0] + edge * weights[1] + pattern * weights[2]
-        
-        return min(total, 10.0)
-    
-    def _get_intensity_level(self, intensity: float) -> str:
-        """Yoğunluk seviyesini string olarak döner"""
-        if intensity < 2:
-            return "Sakin"
-        elif intensity < 4:
-            return "Hafif Dalgalı"
-        elif intensity < 6:
-            return "Orta Dalgalı"
-        elif intensity < 8:
-            return "Dalgalı"
-        else:
-            return "Çok Dalgalı"
-    
-    def _get_intensity_description(self, intensity: float) -> str:
-        """Yoğunluk açıklamasını döner"""
-        if intensity < 2:
-            return "Deniz çok sakin, dalga yok"
-        elif intensity < 4:
-            return "Hafif dalgalar var, güvenli"
-        elif intensity < 6:
-            return "Orta şiddette dalgalar, dikkatli olun"
-        elif intensity < 8:
-            return "Güçlü dalgalar, dikkat gerekli"
-        else:
-            return "Çok güçlü dalgalar, tehlikeli" 
\ No newline at end of file
+        return _pattern_scores(frame[np.newaxis])[0]